@@ -12,6 +12,12 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     
     DATABASE_URL: str = "sqlite+aiosqlite:///./hemut.db"
+    # Comma separated read replica URLs for read-only endpoints
+    DATABASE_REPLICA_URLS: str = ""
+    # Without replicas, serve SQLite reads from a separate mode=ro pool
+    SQLITE_READONLY_REPLICA: bool = False
+    # Reads go to the primary for this long after a client writes
+    READ_YOUR_WRITES_SECONDS: float = 5.0
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -19,10 +25,46 @@ class Settings(BaseSettings):
     # Webhook
     WEBHOOK_URL: str = ""
     
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    # Keep 1 in N records of high-frequency events (connects, failed sends, ...)
+    LOG_SAMPLE_EVERY: int = 100
+    
+    # Rate limiting (per user, or per IP for guests)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_QUESTIONS_PER_MINUTE: int = 10
+    RATE_LIMIT_ANSWERS_PER_MINUTE: int = 30
+    RATE_LIMIT_BURST: int = 5
+    GROUPED_QUESTIONS_MAX_CONCURRENCY: int = 2
+    
+    # WebSocket connections
+    WS_MAX_CONNECTIONS: int = 5000
+    WS_MAX_CONNECTIONS_PER_IP: int = 0
+    WS_PING_INTERVAL_SECONDS: int = 20
+    WS_PING_TIMEOUT_SECONDS: int = 60
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0
+    # Questions sent in the snapshot frame for /ws?snapshot=1
+    WS_SNAPSHOT_SIZE: int = 100
+    # How long a /ws?stats=1 socket has to send its auth message
+    WS_AUTH_TIMEOUT_SECONDS: float = 10.0
+    
+    # Push /admin/stats to admin sockets on /ws?stats=1 every N seconds (0 disables)
+    STATS_PUSH_INTERVAL_SECONDS: int = 0
+    
+    # Archival
+    ARCHIVE_INTERVAL_SECONDS: int = 0
+    ARCHIVE_ANSWERED_AFTER_MINUTES: int = 60
+    ARCHIVE_MAX_AGE_HOURS: int = 24 * 7
+    ARCHIVE_BATCH_SIZE: int = 500
+    
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
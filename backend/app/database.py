@@ -1,30 +1,175 @@
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import declarative_base, Session
+from fastapi import Request
+from typing import Dict, List, Optional
+import itertools
+import time
 from app.config import settings
+from app.auth import decode_access_token
 
+class PrimarySession(Session):
+    pass
+
+# SQL echo is handled by the sqlalchemy.engine logger (see app.logging_config)
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
     future=True
 )
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+def _replica_urls() -> List[str]:
+    urls = settings.replica_urls_list
+    if urls or not settings.SQLITE_READONLY_REPLICA:
+        return urls
+
+    url = make_url(settings.DATABASE_URL)
+    if not url.drivername.startswith("sqlite") or not url.database or url.database == ":memory:":
+        return []
+    return [url.set(database=f"file:{url.database}", query={"mode": "ro", "uri": "true"}).render_as_string(hide_password=False)]
+
+replica_engines = [
+    create_async_engine(url, future=True)
+    for url in _replica_urls()
+]
+
 Base = declarative_base()
 
-async def get_db():
+class SessionRouter:
+    """
+    Hands out session factories: writes always go to the primary, reads are
+    spread over the replicas unless the caller wrote recently, in which case
+    they stay on the primary so the caller sees its own writes.
+    """
+
+    def __init__(self, primary: async_sessionmaker, replicas: List[async_sessionmaker], read_your_writes_seconds: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._replica_cycle = itertools.cycle(replicas) if replicas else None
+        self._last_write: Dict[str, float] = {}
+
+    def mark_write(self, key: str):
+        now = time.monotonic()
+        self._last_write[key] = now
+        if len(self._last_write) > 10000:
+            cutoff = now - self.read_your_writes_seconds
+            self._last_write = {k: t for k, t in self._last_write.items() if t >= cutoff}
+
+    def wrote_recently(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        last_write = self._last_write.get(key)
+        return last_write is not None and time.monotonic() - last_write < self.read_your_writes_seconds
+
+    def for_read(self, key: Optional[str] = None) -> async_sessionmaker:
+        if self._replica_cycle is None or self.wrote_recently(key):
+            return self.primary
+        return next(self._replica_cycle)
+
+session_router = SessionRouter(
+    AsyncSessionLocal,
+    [
+        async_sessionmaker(
+            replica,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        for replica in replica_engines
+    ],
+    settings.READ_YOUR_WRITES_SECONDS,
+)
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_write(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_write(session):
+    if session.info.pop("wrote", False) and session.info.get("client_key"):
+        session_router.mark_write(session.info["client_key"])
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote", None)
+
+def request_client_key(request: Request) -> Optional[str]:
+    """Identify the caller for read-your-writes: the token subject, else the client IP."""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = decode_access_token(authorization[7:])
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    if request.client:
+        return f"ip:{request.client.host}"
+    return None
+
+async def get_db(request: Request):
     async with AsyncSessionLocal() as session:
+        session.info["client_key"] = request_client_key(request)
         try:
             yield session
         finally:
             await session.close()
 
+async def get_read_db(request: Request):
+    session_factory = session_router.for_read(request_client_key(request))
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+def _add_missing_columns(connection) -> List[str]:
+    """create_all never alters existing tables, so add columns introduced since the table was made."""
+    inspector = inspect(connection)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=connection.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            connection.execute(text(ddl))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+def _add_missing_indexes(connection) -> List[str]:
+    """Likewise for indexes declared on tables that already exist."""
+    inspector = inspect(connection)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                added.append(index.name)
+    return added
+
 async def init_db():
+    from app.services.feed import backfill_feed
+    
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        if await conn.run_sync(_add_missing_columns):
+            await conn.run_sync(backfill_feed)
+        await conn.run_sync(_add_missing_indexes)
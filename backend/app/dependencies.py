@@ -1,17 +1,26 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
+from app.database import session_router, request_client_key
 from app.models import User
 from app.auth import decode_access_token
 from typing import Optional
 
 security = HTTPBearer(auto_error=False)
 
+async def load_user(request: Request, user_id: str) -> Optional[User]:
+    """
+    Look the caller up in a short session of its own, on a replica when one
+    is configured. Depending on get_db instead would pin a primary connection
+    until FastAPI tears the dependency down, after the response is sent.
+    """
+    async with session_router.for_read(request_client_key(request))() as db:
+        result = await db.execute(select(User).filter(User.user_id == user_id))
+        return result.scalar_one_or_none()
+
 async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[User]:
     if not credentials:
         return None
@@ -26,14 +35,13 @@ async def get_current_user(
     if user_id is None:
         return None
     
-    result = await db.execute(select(User).filter(User.user_id == user_id))
-    user = result.scalar_one_or_none()
+    user = await load_user(request, user_id)
     
     return user
 
 async def get_current_user_required(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     if not credentials:
         raise HTTPException(
@@ -60,8 +68,7 @@ async def get_current_user_required(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    result = await db.execute(select(User).filter(User.user_id == user_id))
-    user = result.scalar_one_or_none()
+    user = await load_user(request, user_id)
     
     if user is None:
         raise HTTPException(
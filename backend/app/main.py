@@ -1,14 +1,37 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from app.config import settings
-from app.database import init_db
-from app.routers import auth, questions, websocket
+from app.logging_config import setup_logging, stop_logging, RequestIdMiddleware
+from app.database import init_db, AsyncSessionLocal
+from app.routers import auth, questions, websocket, archive
+from app.services.archive import archive_service
+from app.services.snapshot import snapshot_cache
+from app.services.stats import stats_service
+
+setup_logging()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    async with AsyncSessionLocal() as db:
+        await snapshot_cache.load(db)
+        await stats_service.load(db)
+    
+    background_tasks = []
+    if settings.ARCHIVE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(archive_service.run_forever()))
+    if settings.WS_PING_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(websocket.manager.heartbeat()))
+    if settings.STATS_PUSH_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(stats_service.run_forever()))
+    
     yield
+    
+    for task in background_tasks:
+        task.cancel()
+    stop_logging()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -24,11 +47,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(auth.router)
 app.include_router(questions.router)
 app.include_router(websocket.router)
+app.include_router(archive.router)
 from app.routers import admin
 app.include_router(admin.router)
 
@@ -50,5 +76,8 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        # Logging is set up by setup_logging; uvicorn's own config would
+        # re-add its handlers after this module has already run it
+        log_config=None
     )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -35,17 +35,62 @@ class Question(Base):
     status = Column(SQLEnum(QuestionStatus), default=QuestionStatus.PENDING, nullable=False)
     timestamp = Column(DateTime, default=datetime.now, nullable=False, index=True)
     
+    # Denormalized feed fields, kept in step by the routers that write answers
+    username = Column(String, nullable=True)
+    answer_count = Column(Integer, default=0, server_default="0", nullable=False)
+    last_answer_at = Column(DateTime, nullable=True)
+    last_answer_username = Column(String, nullable=True)
+    # Same clock as timestamp, for time-to-answer stats
+    answered_at = Column(DateTime, nullable=True)
+    
     user = relationship("User", back_populates="questions")
     answers = relationship("Answer", back_populates="question", cascade="all, delete-orphan")
+    
+    # Keyset order of the export, (timestamp, question_id) > (:t, :id)
+    __table_args__ = (Index("ix_questions_timestamp_question_id", "timestamp", "question_id"),)
 
 class Answer(Base):
     __tablename__ = "answers"
     
     answer_id = Column(String, primary_key=True, default=generate_uuid)
-    question_id = Column(String, ForeignKey("questions.question_id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(String, ForeignKey("questions.question_id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(String, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=True)
     message = Column(String, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    username = Column(String, nullable=True)
     
     question = relationship("Question", back_populates="answers")
-    user = relationship("User", back_populates="answers")
\ No newline at end of file
+    user = relationship("User", back_populates="answers")
+
+class ArchivedQuestion(Base):
+    __tablename__ = "archived_questions"
+    
+    question_id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=True)
+    message = Column(String, nullable=False)
+    status = Column(SQLEnum(QuestionStatus), nullable=False)
+    timestamp = Column(DateTime, nullable=False, index=True)
+    username = Column(String, nullable=True)
+    answer_count = Column(Integer, default=0, server_default="0", nullable=False)
+    last_answer_at = Column(DateTime, nullable=True)
+    last_answer_username = Column(String, nullable=True)
+    answered_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    user = relationship("User")
+    answers = relationship("ArchivedAnswer", back_populates="question", cascade="all, delete-orphan")
+    
+    __table_args__ = (Index("ix_archived_questions_timestamp_question_id", "timestamp", "question_id"),)
+
+class ArchivedAnswer(Base):
+    __tablename__ = "archived_answers"
+    
+    answer_id = Column(String, primary_key=True)
+    question_id = Column(String, ForeignKey("archived_questions.question_id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=True)
+    message = Column(String, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    username = Column(String, nullable=True)
+    
+    question = relationship("ArchivedQuestion", back_populates="answers")
+    user = relationship("User")
@@ -0,0 +1,124 @@
+from fastapi import Depends, HTTPException, Request, status
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+import math
+import time
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models import User
+
+class RateLimitBackend(ABC):
+    """
+    Storage for rate limit state. The in-memory backend is per worker; swap in
+    a shared implementation with set_rate_limit_backend to limit across workers.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """Take a token from the bucket. Returns 0 if allowed, else seconds until one is available."""
+
+    @abstractmethod
+    async def enter(self, key: str, limit: int) -> bool:
+        """Claim a concurrency slot. Returns False when all slots are taken."""
+
+    @abstractmethod
+    async def exit(self, key: str):
+        """Release a slot claimed with enter."""
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_buckets: int = 10000):
+        self.max_buckets = max_buckets
+        # key -> (tokens, updated, seconds to refill from empty)
+        self.buckets: Dict[str, Tuple[float, float, float]] = {}
+        self.in_flight: Dict[str, int] = {}
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated, _ = self.buckets.get(key, (burst, now, 0))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        # Stored per bucket so pruning honours each scope's own rate
+        refill_time = burst / rate
+
+        if tokens < 1:
+            self.buckets[key] = (tokens, now, refill_time)
+            return (1 - tokens) / rate
+
+        self.buckets[key] = (tokens - 1, now, refill_time)
+        if len(self.buckets) > self.max_buckets:
+            self._prune(now)
+        return 0
+
+    def _prune(self, now: float):
+        # A bucket that has refilled behaves the same as a missing one
+        self.buckets = {
+            key: bucket
+            for key, bucket in self.buckets.items()
+            if now - bucket[1] < bucket[2]
+        }
+
+    async def enter(self, key: str, limit: int) -> bool:
+        current = self.in_flight.get(key, 0)
+        if current >= limit:
+            return False
+        self.in_flight[key] = current + 1
+        return True
+
+    async def exit(self, key: str):
+        self.in_flight[key] = max(0, self.in_flight.get(key, 1) - 1)
+
+rate_limit_backend: RateLimitBackend = InMemoryRateLimitBackend()
+
+def set_rate_limit_backend(backend: RateLimitBackend):
+    global rate_limit_backend
+    rate_limit_backend = backend
+
+def too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+class RateLimit:
+    """Token bucket dependency keyed by user id, or client IP for guests."""
+
+    def __init__(self, scope: str, per_minute: int, burst: int = settings.RATE_LIMIT_BURST):
+        self.scope = scope
+        self.per_minute = per_minute
+        self.burst = burst
+
+    async def __call__(
+        self,
+        request: Request,
+        current_user: Optional[User] = Depends(get_current_user)
+    ):
+        if not settings.RATE_LIMIT_ENABLED or self.per_minute <= 0:
+            return
+
+        if current_user:
+            key = f"{self.scope}:user:{current_user.user_id}"
+        else:
+            key = f"{self.scope}:ip:{request.client.host if request.client else 'unknown'}"
+
+        retry_after = await rate_limit_backend.acquire(key, self.per_minute / 60, self.burst)
+        if retry_after > 0:
+            raise too_many_requests(retry_after)
+
+class ConcurrencyLimit:
+    """Caps how many requests may run an expensive endpoint at once, rejecting the rest immediately."""
+
+    def __init__(self, scope: str, limit: int):
+        self.scope = scope
+        self.limit = limit
+
+    async def __call__(self):
+        if not settings.RATE_LIMIT_ENABLED or self.limit <= 0:
+            yield
+            return
+
+        if not await rate_limit_backend.enter(self.scope, self.limit):
+            raise too_many_requests(1)
+        try:
+            yield
+        finally:
+            await rate_limit_backend.exit(self.scope)
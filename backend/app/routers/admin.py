@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db, session_router
 from app.models import User, Question, Answer, QuestionStatus
-from app.schemas import QuestionResponse, BulkAnswerRequest, GroupedQuestionsResponse
+from app.schemas import QuestionResponse, BulkAnswerRequest, GroupedQuestionsResponse, DashboardStatsResponse
 from app.dependencies import get_current_user, get_current_admin
+from app.ratelimit import RateLimit, ConcurrencyLimit
+from app.config import settings
 from app.services.clustering import ClusterService
+from app.services.archive import archive_service
+from app.services.snapshot import snapshot_cache
+from app.services.feed import record_answer
+from app.services.stats import stats_service
+from app.services.export import export_stream
 import uuid
 from datetime import datetime
 
@@ -18,22 +26,24 @@ router = APIRouter(
 
 cluster_service = ClusterService()
 
-@router.get("/grouped-questions", response_model=List[GroupedQuestionsResponse])
-async def get_grouped_questions(db: Session = Depends(get_db)):
+@router.get(
+    "/grouped-questions",
+    response_model=List[GroupedQuestionsResponse],
+    dependencies=[Depends(ConcurrencyLimit("grouped-questions", settings.GROUPED_QUESTIONS_MAX_CONCURRENCY))]
+)
+async def get_grouped_questions(db: Session = Depends(get_read_db)):
     """
     Get all pending questions grouped by similarity.
     """
-    # Fetch all pending questions with relationships
-    from sqlalchemy.orm import selectinload
-    
+    # Usernames are denormalized onto the row, so no relationship loads are needed
     query = (
         select(Question)
         .where(Question.status == QuestionStatus.PENDING)
-        .options(selectinload(Question.user))
-        .options(selectinload(Question.answers))
     )
     result = await db.execute(query)
     questions = result.scalars().all()
+    # Hand the connection back before the CPU-bound clustering
+    await db.close()
     
     # Group them
     grouped = cluster_service.group_questions(questions)
@@ -45,7 +55,7 @@ async def get_grouped_questions(db: Session = Depends(get_db)):
             q_dict = {
                 "question_id": q.question_id,
                 "user_id": q.user_id,
-                "username": q.user.username if q.user else "Guest",
+                "username": q.username or "Guest",
                 "message": q.message,
                 "status": q.status,
                 "timestamp": q.timestamp,
@@ -56,7 +66,10 @@ async def get_grouped_questions(db: Session = Depends(get_db)):
     
     return grouped
 
-@router.post("/bulk-answer")
+@router.post(
+    "/bulk-answer",
+    dependencies=[Depends(RateLimit("bulk-answer", settings.RATE_LIMIT_ANSWERS_PER_MINUTE))]
+)
 async def bulk_answer_questions(
     request: BulkAnswerRequest,
     current_user: User = Depends(get_current_admin),
@@ -75,7 +88,9 @@ async def bulk_answer_questions(
             raise HTTPException(status_code=404, detail="No questions found")
             
         timestamp = datetime.utcnow()
+        answered_at = datetime.now()
         new_answers = []
+        transitions = []
         
         for question in questions:
             if question.status == QuestionStatus.ANSWERED:
@@ -86,19 +101,81 @@ async def bulk_answer_questions(
                 answer_id=str(uuid.uuid4()),
                 question_id=question.question_id,
                 user_id=current_user.user_id,
+                username=current_user.username,
                 message=request.answer,
                 timestamp=timestamp
             )
+            # Skip questions archived since they were read
+            updated = await db.execute(record_answer(question.question_id, answer))
+            if updated.rowcount == 0:
+                continue
             new_answers.append(answer)
             
             # Update Question Status
+            transitions.append((question.status, question.timestamp))
             question.status = QuestionStatus.ANSWERED
+            question.answered_at = answered_at
             
         db.add_all(new_answers)
         await db.commit()
         
+        for answer in new_answers:
+            snapshot_cache.update_question(
+                answer.question_id,
+                status=QuestionStatus.ANSWERED,
+                new_answer={
+                    "answer_id": answer.answer_id,
+                    "question_id": answer.question_id,
+                    "user_id": answer.user_id,
+                    "username": answer.username or "Guest",
+                    "message": answer.message,
+                    "timestamp": answer.timestamp
+                }
+            )
+        for previous_status, question_timestamp in transitions:
+            stats_service.record_status_change(previous_status, QuestionStatus.ANSWERED, question_timestamp, answered_at)
+        
         return {"message": f"Successfully answered {len(new_answers)} questions"}
         
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats", response_model=DashboardStatsResponse)
+async def get_stats():
+    """
+    Live question counts, questions per minute and time-to-answer percentiles,
+    served from in-memory counters rather than aggregate queries.
+    """
+    return stats_service.snapshot()
+
+@router.post("/archive")
+async def archive_questions(before: Optional[datetime] = None):
+    """
+    Move questions out of the live tables into the archive.
+    With `before`, archives every question older than that time (e.g. at the
+    end of an event session); otherwise applies the configured retention policy.
+    """
+    archived = await archive_service.archive(before=before)
+    return {"message": f"Archived {archived} questions", "archived": archived}
+
+@router.get("/export")
+async def export_questions(
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    gzip: bool = False,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    statuses: Optional[List[QuestionStatus]] = Query(None, alias="status"),
+    include_archived: bool = True,
+):
+    """
+    Stream the Q&A history (questions joined with answers and usernames) as
+    CSV or JSONL, optionally gzipped, filtered by question time and status.
+    Archived questions are included unless include_archived=false.
+    """
+    filename = f"questions.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_stream(session_router.for_read(), format, gzip, start, end, statuses, include_archived=include_archived),
+        media_type="application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson"),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+from datetime import datetime
+from app.database import get_read_db
+from app.models import ArchivedQuestion, User
+from app.schemas import QuestionResponse
+from app.dependencies import get_current_user
+
+router = APIRouter(prefix="/archive", tags=["Archive"])
+
+def serialize_archived_question(question: ArchivedQuestion) -> QuestionResponse:
+    return QuestionResponse(
+        question_id=question.question_id,
+        user_id=question.user_id,
+        username=question.username or "Guest",
+        message=question.message,
+        status=question.status,
+        timestamp=question.timestamp,
+        answers=[
+            {
+                "answer_id": answer.answer_id,
+                "question_id": answer.question_id,
+                "user_id": answer.user_id,
+                "username": answer.username or "Guest",
+                "message": answer.message,
+                "timestamp": answer.timestamp
+            }
+            for answer in question.answers
+        ]
+    )
+
+@router.get("/questions", response_model=List[QuestionResponse])
+async def get_archived_questions(
+    before: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Page through archived questions, newest first"""
+    query = (
+        select(ArchivedQuestion)
+        .options(selectinload(ArchivedQuestion.answers))
+        .order_by(ArchivedQuestion.timestamp.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if before is not None:
+        query = query.where(ArchivedQuestion.timestamp < before)
+
+    result = await db.execute(query)
+    return [serialize_archived_question(q) for q in result.scalars().all()]
+
+@router.get("/questions/{question_id}", response_model=QuestionResponse)
+async def get_archived_question(
+    question_id: str,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(ArchivedQuestion)
+        .options(selectinload(ArchivedQuestion.answers))
+        .filter(ArchivedQuestion.question_id == question_id)
+    )
+    question = result.scalar_one_or_none()
+
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived question not found"
+        )
+
+    return serialize_archived_question(question)
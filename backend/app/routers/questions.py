@@ -1,20 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional, AsyncIterator
+from itertools import groupby
+from datetime import datetime
 import httpx
-from app.database import get_db
+import logging
+from app.database import get_db, get_read_db, session_router, request_client_key
 from app.models import Question, Answer, User, QuestionStatus
 from app.schemas import (
     QuestionCreate, 
     QuestionResponse, 
+    QuestionFeedItem,
     AnswerCreate, 
     AnswerResponse
 )
 from app.dependencies import get_current_user, get_current_admin
+from app.ratelimit import RateLimit
+from app.services.feed import record_answer
+from app.services.stats import stats_service
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/questions", tags=["Questions"])
 
 active_connections = []
@@ -35,18 +45,17 @@ async def send_webhook(question_id: str, status: str):
                 timeout=5.0
             )
     except Exception as e:
-        print(f"Webhook error: {e}")
+        logger.error("Webhook error: %s", e, extra={"question_id": question_id})
 
 @router.get("", response_model=List[QuestionResponse])
 async def get_questions(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all questions with answers"""
     result = await db.execute(
         select(Question)
-        .options(selectinload(Question.answers).selectinload(Answer.user))
-        .options(selectinload(Question.user))
+        .options(selectinload(Question.answers))
         .order_by(Question.timestamp.desc())
     )
     questions = result.scalars().all()
@@ -56,7 +65,7 @@ async def get_questions(
         question_dict = {
             "question_id": question.question_id,
             "user_id": question.user_id,
-            "username": question.user.username if question.user else "Guest",
+            "username": question.username or "Guest",
             "message": question.message,
             "status": question.status,
             "timestamp": question.timestamp,
@@ -65,7 +74,7 @@ async def get_questions(
                     "answer_id": answer.answer_id,
                     "question_id": answer.question_id,
                     "user_id": answer.user_id,
-                    "username": answer.user.username if answer.user else "Guest",
+                    "username": answer.username or "Guest",
                     "message": answer.message,
                     "timestamp": answer.timestamp
                 }
@@ -76,7 +85,130 @@ async def get_questions(
     
     return response
 
-@router.post("", response_model=QuestionResponse, status_code=status.HTTP_201_CREATED)
+@router.get("/feed", response_model=List[QuestionFeedItem])
+async def get_question_feed(
+    before: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Compact question feed with answer counts, served from the questions table alone"""
+    query = (
+        select(Question)
+        .order_by(Question.timestamp.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        query = query.where(Question.timestamp < before)
+    
+    result = await db.execute(query)
+    return [
+        QuestionFeedItem(
+            question_id=question.question_id,
+            user_id=question.user_id,
+            username=question.username or "Guest",
+            message=question.message,
+            status=question.status,
+            timestamp=question.timestamp,
+            answer_count=question.answer_count,
+            last_answer_at=question.last_answer_at,
+            last_answer_username=question.last_answer_username
+        )
+        for question in result.scalars().all()
+    ]
+
+async def stream_questions(session_factory, format: str, chunk_size: int) -> AsyncIterator[str]:
+    """
+    Yield the question list chunk by chunk from a server-side cursor, so
+    memory is bounded by chunk_size rather than the number of questions.
+    """
+    async with session_factory() as db:
+        result = await db.stream(
+            select(
+                Question.question_id,
+                Question.user_id,
+                Question.username,
+                Question.message,
+                Question.status,
+                Question.timestamp,
+            )
+            .order_by(Question.timestamp.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+
+        first = True
+        if format == "json":
+            yield "["
+
+        async for rows in result.partitions(chunk_size):
+            answer_rows = await db.execute(
+                select(
+                    Answer.answer_id,
+                    Answer.question_id,
+                    Answer.user_id,
+                    Answer.username,
+                    Answer.message,
+                    Answer.timestamp,
+                )
+                .where(Answer.question_id.in_([row.question_id for row in rows]))
+                .order_by(Answer.question_id, Answer.timestamp)
+            )
+            answers_by_question = {
+                question_id: [
+                    {
+                        "answer_id": answer.answer_id,
+                        "question_id": answer.question_id,
+                        "user_id": answer.user_id,
+                        "username": answer.username or "Guest",
+                        "message": answer.message,
+                        "timestamp": answer.timestamp
+                    }
+                    for answer in answers
+                ]
+                for question_id, answers in groupby(answer_rows.all(), key=lambda a: a.question_id)
+            }
+
+            encoded = []
+            for row in rows:
+                question = QuestionResponse(
+                    question_id=row.question_id,
+                    user_id=row.user_id,
+                    username=row.username or "Guest",
+                    message=row.message,
+                    status=row.status,
+                    timestamp=row.timestamp,
+                    answers=answers_by_question.get(row.question_id, [])
+                ).model_dump_json()
+                if format == "json":
+                    encoded.append(question if first else "," + question)
+                else:
+                    encoded.append(question + "\n")
+                first = False
+            yield "".join(encoded)
+
+        if format == "json":
+            yield "]"
+
+@router.get("/stream")
+async def get_questions_stream(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    chunk_size: int = Query(500, ge=1, le=5000),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream all questions with answers as NDJSON or an incrementally encoded JSON array"""
+    session_factory = session_router.for_read(request_client_key(request))
+    return StreamingResponse(
+        stream_questions(session_factory, format, chunk_size),
+        media_type="application/x-ndjson" if format == "ndjson" else "application/json"
+    )
+
+@router.post(
+    "",
+    response_model=QuestionResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("questions", settings.RATE_LIMIT_QUESTIONS_PER_MINUTE))]
+)
 async def create_question(
     question_data: QuestionCreate,
     db: AsyncSession = Depends(get_db),
@@ -85,32 +217,27 @@ async def create_question(
     new_question = Question(
         message=question_data.message,
         user_id=current_user.user_id if current_user else None,
+        username=current_user.username if current_user else None,
         status=QuestionStatus.PENDING
     )
     
     db.add(new_question)
     await db.commit()
     await db.refresh(new_question)
-    
-    result = await db.execute(
-        select(Question)
-        .options(selectinload(Question.user))
-        .filter(Question.question_id == new_question.question_id)
-    )
-    new_question = result.scalar_one()
+    stats_service.record_question()
     
     # Prepare response
     response_data = {
         "question_id": new_question.question_id,
         "user_id": new_question.user_id,
-        "username": new_question.user.username if new_question.user else "Guest",
+        "username": new_question.username or "Guest",
         "message": new_question.message,
         "status": new_question.status,
         "timestamp": new_question.timestamp,
         "answers": []
     }
     
-    print(f"Broadcasting new question: {new_question.question_id}")
+    logger.info("Broadcasting new question", extra={"question_id": new_question.question_id, "sample": "question.broadcast"})
     from app.routers.websocket import broadcast_message
     await broadcast_message({
         "type": "new_question",
@@ -128,8 +255,7 @@ async def mark_question_answered(
 ):
     result = await db.execute(
         select(Question)
-        .options(selectinload(Question.user))
-        .options(selectinload(Question.answers).selectinload(Answer.user))
+        .options(selectinload(Question.answers))
         .filter(Question.question_id == question_id)
     )
     question = result.scalar_one_or_none()
@@ -140,16 +266,20 @@ async def mark_question_answered(
             detail="Question not found"
         )
     
+    previous_status = question.status
     question.status = QuestionStatus.ANSWERED
+    if previous_status != QuestionStatus.ANSWERED:
+        question.answered_at = datetime.now()
     await db.commit()
     await db.refresh(question)
+    stats_service.record_status_change(previous_status, question.status, question.timestamp, question.answered_at)
     
     background_tasks.add_task(send_webhook, question_id, "Answered")
     
     response_data = {
         "question_id": question.question_id,
         "user_id": question.user_id,
-        "username": question.user.username if question.user else "Guest",
+        "username": question.username or "Guest",
         "message": question.message,
         "status": question.status,
         "timestamp": question.timestamp,
@@ -158,7 +288,7 @@ async def mark_question_answered(
                 "answer_id": answer.answer_id,
                 "question_id": answer.question_id,
                 "user_id": answer.user_id,
-                "username": answer.user.username if answer.user else "Guest",
+                "username": answer.username or "Guest",
                 "message": answer.message,
                 "timestamp": answer.timestamp
             }
@@ -184,8 +314,7 @@ async def escalate_question(
     
     result = await db.execute(
         select(Question)
-        .options(selectinload(Question.user))
-        .options(selectinload(Question.answers).selectinload(Answer.user))
+        .options(selectinload(Question.answers))
         .filter(Question.question_id == question_id)
     )
     question = result.scalar_one_or_none()
@@ -196,15 +325,17 @@ async def escalate_question(
             detail="Question not found"
         )
     
+    previous_status = question.status
     question.status = QuestionStatus.ESCALATED
     await db.commit()
     await db.refresh(question)
+    stats_service.record_status_change(previous_status, question.status, question.timestamp)
     
     # Prepare response
     response_data = {
         "question_id": question.question_id,
         "user_id": question.user_id,
-        "username": question.user.username if question.user else "Guest",
+        "username": question.username or "Guest",
         "message": question.message,
         "status": question.status,
         "timestamp": question.timestamp,
@@ -213,7 +344,7 @@ async def escalate_question(
                 "answer_id": answer.answer_id,
                 "question_id": answer.question_id,
                 "user_id": answer.user_id,
-                "username": answer.user.username if answer.user else "Guest",
+                "username": answer.username or "Guest",
                 "message": answer.message,
                 "timestamp": answer.timestamp
             }
@@ -229,7 +360,12 @@ async def escalate_question(
     
     return QuestionResponse(**response_data)
 
-@router.post("/{question_id}/answers", response_model=AnswerResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{question_id}/answers",
+    response_model=AnswerResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("answers", settings.RATE_LIMIT_ANSWERS_PER_MINUTE))]
+)
 async def create_answer(
     question_id: str,
     answer_data: AnswerCreate,
@@ -250,27 +386,30 @@ async def create_answer(
     new_answer = Answer(
         question_id=question_id,
         user_id=current_user.user_id if current_user else None,
-        message=answer_data.message
+        username=current_user.username if current_user else None,
+        message=answer_data.message,
+        timestamp=datetime.utcnow()
     )
     
+    # Re-check inside the write transaction: the question may have been archived since
+    result = await db.execute(record_answer(question_id, new_answer))
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
     db.add(new_answer)
     await db.commit()
     await db.refresh(new_answer)
     
     
-    result = await db.execute(
-        select(Answer)
-        .options(selectinload(Answer.user))
-        .filter(Answer.answer_id == new_answer.answer_id)
-    )
-    new_answer = result.scalar_one()
-    
-    
     response_data = {
         "answer_id": new_answer.answer_id,
         "question_id": new_answer.question_id,
         "user_id": new_answer.user_id,
-        "username": new_answer.user.username if new_answer.user else "Guest",
+        "username": new_answer.username or "Guest",
         "message": new_answer.message,
         "timestamp": new_answer.timestamp
     }
@@ -1,27 +1,167 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List, Dict, Any
+from typing import Dict, Any, List, Optional, Set
+import asyncio
 import json
 import logging
+import time
+import uuid
+from sqlalchemy import select
+from app.config import settings
+from app.auth import decode_access_token
+from app.database import AsyncSessionLocal
+from app.models import User
+from app.services.snapshot import snapshot_cache
+from app.logging_config import connection_id_var
 
-
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 1013: "Try Again Later"
+CLOSE_CAPACITY = 1013
+# 1001: "Going Away"
+CLOSE_IDLE = 1001
+# 1008: "Policy Violation"
+CLOSE_FORBIDDEN = 1008
+# 1011: "Internal Error", a send failed or timed out
+CLOSE_SEND_FAILED = 1011
+
+PING_MESSAGE = json.dumps({"type": "ping", "data": {}})
+
+class ConnectionState:
+    __slots__ = ("id", "ip", "last_seen", "pending", "stats")
+
+    def __init__(self, ip: str, buffer: bool = False):
+        self.id = connection_id_var.get()
+        self.ip = ip
+        self.last_seen = time.monotonic()
+        # Live messages held back until the snapshot frame has gone out
+        self.pending: Optional[List[str]] = [] if buffer else None
+        # Admin socket subscribed to dashboard stats pushes, set once it has authenticated
+        self.stats = False
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(
+        self,
+        max_connections: int = settings.WS_MAX_CONNECTIONS,
+        max_connections_per_ip: int = settings.WS_MAX_CONNECTIONS_PER_IP,
+        ping_interval: int = settings.WS_PING_INTERVAL_SECONDS,
+        ping_timeout: int = settings.WS_PING_TIMEOUT_SECONDS,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_ip = max_connections_per_ip
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.send_timeout = send_timeout
+        # Dict keeps insertion order and gives O(1) removal
+        self.active_connections: Dict[WebSocket, ConnectionState] = {}
+        self.connections_per_ip: Dict[str, int] = {}
+        # Closes of dropped sockets, held so they aren't garbage collected mid-flight
+        self._closing: Set[asyncio.Task] = set()
+
+    def _rejection_reason(self, ip: str):
+        if self.max_connections and len(self.active_connections) >= self.max_connections:
+            return "Server at capacity"
+        if self.max_connections_per_ip and self.connections_per_ip.get(ip, 0) >= self.max_connections_per_ip:
+            return "Too many connections from this address"
+        return None
+
+    async def connect(self, websocket: WebSocket, buffer: bool = False) -> bool:
+        ip = websocket.client.host if websocket.client else "unknown"
+
+        reason = self._rejection_reason(ip)
+        if reason:
+            logger.warning("Rejected connection from %s: %s", ip, reason, extra={"sample": "ws.rejected"})
+            # Reject the handshake rather than accept-then-close: an accepted
+            # socket fires the browser's onopen, which resets its reconnect backoff
+            await websocket.close(code=CLOSE_CAPACITY, reason=reason)
+            return False
 
-    async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"Client connected. Total connections: {len(self.active_connections)}")
+
+        self.active_connections[websocket] = ConnectionState(ip, buffer)
+        self.connections_per_ip[ip] = self.connections_per_ip.get(ip, 0) + 1
+        logger.info(
+            "Client connected",
+            extra={"connections": len(self.active_connections), "sample": "ws.connect"}
+        )
+        return True
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"Client disconnected. Total connections: {len(self.active_connections)}")
+        state = self.active_connections.pop(websocket, None)
+        if state is None:
+            return
+
+        remaining = self.connections_per_ip.get(state.ip, 1) - 1
+        if remaining > 0:
+            self.connections_per_ip[state.ip] = remaining
+        else:
+            self.connections_per_ip.pop(state.ip, None)
+        logger.info(
+            "Client disconnected",
+            extra={"connection_id": state.id, "connections": len(self.active_connections), "sample": "ws.disconnect"}
+        )
+
+    def touch(self, websocket: WebSocket):
+        state = self.active_connections.get(websocket)
+        if state:
+            state.last_seen = time.monotonic()
+
+    async def _send(self, websocket: WebSocket, message_str: str) -> bool:
+        try:
+            await asyncio.wait_for(websocket.send_text(message_str), self.send_timeout)
+            return True
+        except Exception as e:
+            state = self.active_connections.get(websocket)
+            logger.error(
+                "Error sending message to client: %s", e,
+                extra={"connection_id": state.id if state else None, "sample": "ws.send_error"}
+            )
+            return False
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await asyncio.wait_for(websocket.close(code=code), self.send_timeout)
+        except Exception:
+            pass
+
+    def _drop(self, websockets: List[WebSocket]):
+        """
+        Forget sockets whose send failed and close them in the background, so
+        their receive loop ends and the client reconnects instead of sitting
+        on a connection that gets no more events.
+        """
+        for websocket in websockets:
+            self.disconnect(websocket)
+            task = asyncio.create_task(self._close(websocket, CLOSE_SEND_FAILED))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def send_snapshot(self, websocket: WebSocket, frame: str):
+        """Send the snapshot, then anything broadcast meanwhile, then switch to live delivery."""
+        state = self.active_connections.get(websocket)
+        if state is None:
+            return
+
+        sent = await self._send(websocket, frame)
+        while sent and state.pending:
+            sent = await self._send(websocket, state.pending.pop(0))
+        state.pending = None
+
+        if not sent:
+            self._drop([websocket])
+
+    async def _fan_out(self, message_str: str):
+        connections: List[WebSocket] = []
+        for connection, state in self.active_connections.items():
+            if state.pending is not None:
+                state.pending.append(message_str)
+            else:
+                connections.append(connection)
+        results = await asyncio.gather(*(self._send(c, message_str) for c in connections))
+
+        self._drop([connection for connection, sent in zip(connections, results) if not sent])
 
     async def broadcast(self, message: Dict[str, Any]):
         if not self.active_connections:
@@ -30,34 +170,108 @@ class ConnectionManager:
         try:
             message_str = json.dumps(message, default=str)
         except Exception as e:
-            logger.error(f"Failed to serialize message: {e}")
+            logger.error("Failed to serialize message: %s", e)
+            return
+
+        await self._fan_out(message_str)
+
+    def subscribe_stats(self, websocket: WebSocket):
+        state = self.active_connections.get(websocket)
+        if state:
+            state.stats = True
+
+    async def send_stats(self, message: Dict[str, Any]):
+        """Push to the admin sockets that subscribed with ?stats=1 and authenticated only."""
+        connections = [
+            connection for connection, state in self.active_connections.items()
+            # Snapshot-pending sockets just get the next push
+            if state.stats and state.pending is None
+        ]
+        if not connections:
             return
 
-        to_remove = []
-        for connection in self.active_connections:
+        message_str = json.dumps(message, default=str)
+        results = await asyncio.gather(*(self._send(c, message_str) for c in connections))
+        self._drop([connection for connection, sent in zip(connections, results) if not sent])
+
+    async def reap_idle(self):
+        cutoff = time.monotonic() - self.ping_timeout
+        idle = [ws for ws, state in self.active_connections.items() if state.last_seen < cutoff]
+        for websocket in idle:
+            self.disconnect(websocket)
+
+        if idle:
+            logger.info("Reaped idle connections", extra={"reaped": len(idle)})
+            await asyncio.gather(*(self._close(ws, CLOSE_IDLE) for ws in idle))
+
+    async def heartbeat(self):
+        """Ping every client on an interval and drop the ones that stopped answering."""
+        while True:
+            await asyncio.sleep(self.ping_interval)
             try:
-                await connection.send_text(message_str)
+                await self.reap_idle()
+                if self.active_connections:
+                    await self._fan_out(PING_MESSAGE)
             except Exception as e:
-                logger.error(f"Error sending message to client: {e}")
-                to_remove.append(connection)
-
-        for connection in to_remove:
-            self.disconnect(connection)
+                logger.error("Heartbeat failed: %s", e)
 
 manager = ConnectionManager()
 
+async def is_admin_token(token: Optional[str]) -> bool:
+    payload = decode_access_token(token) if token else None
+    if not payload or not payload.get("sub"):
+        return False
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.is_admin).filter(User.user_id == payload["sub"]))
+        return bool(result.scalar_one_or_none())
+
+async def authenticate_admin(websocket: WebSocket) -> bool:
+    """
+    Read the {"type": "auth", "token": ...} message a stats socket must send
+    first. Browsers can't set headers on a WebSocket, and a token in the
+    query string would end up in access logs, so it travels in a frame.
+    """
+    try:
+        data = await asyncio.wait_for(websocket.receive_text(), settings.WS_AUTH_TIMEOUT_SECONDS)
+        message = json.loads(data)
+    except (asyncio.TimeoutError, ValueError):
+        return False
+    if not isinstance(message, dict) or message.get("type") != "auth":
+        return False
+    manager.touch(websocket)
+    return await is_admin_token(message.get("token"))
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(
+    websocket: WebSocket,
+    snapshot: bool = False,
+    stats: bool = False
+):
+    connection_id_var.set(uuid.uuid4().hex)
+    if not await manager.connect(websocket, buffer=snapshot):
+        return
     try:
+        if snapshot:
+            # Taken right after registering, with no await in between, so
+            # every later event is either in the snapshot or in the buffer
+            await manager.send_snapshot(websocket, snapshot_cache.frame())
+        if stats:
+            if not await authenticate_admin(websocket):
+                await websocket.close(code=CLOSE_FORBIDDEN)
+                manager.disconnect(websocket)
+                return
+            manager.subscribe_stats(websocket)
         while True:
             data = await websocket.receive_text()
-            logger.debug(f"Received from client: {data}")
+            # Any inbound frame (including "pong") counts as liveness
+            manager.touch(websocket)
+            logger.debug("Received from client: %s", data)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         manager.disconnect(websocket)
 
 async def broadcast_message(message: dict):
-    await manager.broadcast(message)
\ No newline at end of file
+    snapshot_cache.apply(message)
+    await manager.broadcast(message)
@@ -65,6 +65,19 @@ class QuestionResponse(QuestionBase):
     class Config:
         from_attributes = True
 
+class QuestionFeedItem(QuestionBase):
+    question_id: str
+    user_id: Optional[str]
+    username: Optional[str]
+    status: QuestionStatus
+    timestamp: datetime
+    answer_count: int
+    last_answer_at: Optional[datetime] = None
+    last_answer_username: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 class QuestionUpdate(BaseModel):
     status: Optional[QuestionStatus] = None
 
@@ -73,6 +86,20 @@ class BulkAnswerRequest(BaseModel):
     question_ids: List[str]
     answer: str
 
+class TimeToAnswerStats(BaseModel):
+    count: int
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+class DashboardStatsResponse(BaseModel):
+    pending: int
+    escalated: int
+    answered: int
+    total: int
+    questions_per_minute: int
+    time_to_answer_seconds: TimeToAnswerStats
+
 class GroupedQuestionsResponse(BaseModel):
     title: str
     count: int
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, insert, delete, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Question, Answer, ArchivedQuestion, ArchivedAnswer, QuestionStatus
+
+logger = logging.getLogger(__name__)
+
+class ArchiveService:
+    """
+    Moves answered or old questions (and their answers) out of the live
+    tables into the archive tables, one small transaction per batch so
+    writers are never blocked for long.
+    """
+
+    def __init__(self, batch_size: int = settings.ARCHIVE_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def _condition(self, before: Optional[datetime] = None):
+        if before is not None:
+            return Question.timestamp < before
+
+        # Question.timestamp and answered_at are written with datetime.now, so compare on the same clock
+        now = datetime.now()
+        answered_cutoff = now - timedelta(minutes=settings.ARCHIVE_ANSWERED_AFTER_MINUTES)
+        max_age_cutoff = now - timedelta(hours=settings.ARCHIVE_MAX_AGE_HOURS)
+        return or_(
+            and_(
+                Question.status == QuestionStatus.ANSWERED,
+                # Rows answered before answered_at existed only have the question time
+                func.coalesce(Question.answered_at, Question.timestamp) < answered_cutoff,
+            ),
+            Question.timestamp < max_age_cutoff,
+        )
+
+    async def archive_batch(self, db: AsyncSession, condition) -> int:
+        # Lock the batch so answers and status changes wait for (and then miss)
+        # the archived rows instead of slipping in between the copy and the delete.
+        # SQLite has no row locks; its single writer gives the same guarantee.
+        result = await db.execute(
+            select(Question.question_id)
+            .where(condition)
+            .order_by(Question.timestamp)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        question_ids = result.scalars().all()
+        if not question_ids:
+            return 0
+
+        # Archive exactly the rows that were deleted
+        result = await db.execute(
+            delete(Answer)
+            .where(Answer.question_id.in_(question_ids))
+            .returning(
+                Answer.answer_id,
+                Answer.question_id,
+                Answer.user_id,
+                Answer.message,
+                Answer.timestamp,
+                Answer.username,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        answers = [dict(row) for row in result.mappings()]
+        result = await db.execute(
+            delete(Question)
+            .where(Question.question_id.in_(question_ids))
+            .returning(
+                Question.question_id,
+                Question.user_id,
+                Question.message,
+                Question.status,
+                Question.timestamp,
+                Question.username,
+                Question.answer_count,
+                Question.last_answer_at,
+                Question.last_answer_username,
+                Question.answered_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        archived_at = datetime.utcnow()
+        questions = [dict(row, archived_at=archived_at) for row in result.mappings()]
+
+        await db.execute(insert(ArchivedQuestion), questions)
+        if answers:
+            await db.execute(insert(ArchivedAnswer), answers)
+        await db.commit()
+
+        archived_ids = [q["question_id"] for q in questions]
+        # Also drops them from the snapshot cache
+        from app.routers.websocket import broadcast_message
+        await broadcast_message({"type": "questions_archived", "data": {"question_ids": archived_ids}})
+        return len(questions)
+
+    async def archive(self, before: Optional[datetime] = None) -> int:
+        """Archive every matching question, batch by batch. Returns the number archived."""
+        condition = self._condition(before)
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                try:
+                    archived = await self.archive_batch(db, condition)
+                except Exception:
+                    await db.rollback()
+                    raise
+            total += archived
+            if archived < self.batch_size:
+                break
+            # Let queued requests run between batches
+            await asyncio.sleep(0)
+
+        if total:
+            logger.info("Archived questions", extra={"archived": total})
+        return total
+
+    async def run_forever(self, interval: int = settings.ARCHIVE_INTERVAL_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.archive()
+            except Exception as e:
+                logger.error("Archival run failed: %s", e)
+
+archive_service = ArchiveService()
@@ -1,9 +1,25 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import AgglomerativeClustering
 from typing import List, Dict, Any
+import logging
 from app.models import Question
 
+logger = logging.getLogger(__name__)
+
 class ClusterService:
+    def cluster_labels(self, messages: List[str]) -> List[int]:
+        """TF-IDF + average-linkage agglomerative labels. Errors propagate to the caller."""
+        vectorizer = TfidfVectorizer(stop_words='english')
+        tfidf_matrix = vectorizer.fit_transform(messages)
+
+        clustering = AgglomerativeClustering(
+            n_clusters=None,
+            distance_threshold=0.6,
+            metric='cosine',
+            linkage='average'
+        )
+        return clustering.fit_predict(tfidf_matrix.toarray())
+
     def group_questions(self, questions: List[Question]) -> List[Dict[str, Any]]:
         if not questions:
             return []
@@ -17,17 +33,7 @@ class ClusterService:
             }]
 
         try:
-            
-            vectorizer = TfidfVectorizer(stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform(messages)
-
-            clustering = AgglomerativeClustering(
-                n_clusters=None,
-                distance_threshold=0.6,
-                metric='cosine',
-                linkage='average'
-            )
-            labels = clustering.fit_predict(tfidf_matrix.toarray())
+            labels = self.cluster_labels(messages)
 
 
             groups = {}
@@ -51,5 +57,5 @@ class ClusterService:
             return result
 
         except Exception as e:
-            print(f"Error in clustering: {e}")
+            logger.error("Error in clustering: %s", e)
             return [{"title": q.message, "questions": [q], "count": 1} for q in questions] 
@@ -0,0 +1,192 @@
+import csv
+import heapq
+import io
+import json
+import zlib
+from datetime import datetime
+from itertools import groupby
+from typing import AsyncIterator, Dict, List, Optional, Any
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.models import Question, Answer, ArchivedQuestion, ArchivedAnswer, QuestionStatus
+
+CSV_COLUMNS = [
+    "question_id", "question_user_id", "question_username", "question_message", "status",
+    "question_timestamp", "answered_at", "answer_id", "answer_user_id", "answer_username",
+    "answer_message", "answer_timestamp",
+]
+
+def _question_query(question_model, start, end, statuses, last_key, chunk_size):
+    query = select(
+        question_model.question_id,
+        question_model.user_id,
+        question_model.username,
+        question_model.message,
+        question_model.status,
+        question_model.timestamp,
+        question_model.answered_at,
+    )
+    if start is not None:
+        query = query.where(question_model.timestamp >= start)
+    if end is not None:
+        query = query.where(question_model.timestamp < end)
+    if statuses:
+        query = query.where(question_model.status.in_(statuses))
+    if last_key is not None:
+        # A row-value comparison is a single range seek on the composite index;
+        # the equivalent OR of two predicates isn't
+        query = query.where(tuple_(question_model.timestamp, question_model.question_id) > tuple_(*last_key))
+    return (
+        query
+        .order_by(question_model.timestamp, question_model.question_id)
+        .limit(chunk_size)
+        .execution_options(yield_per=chunk_size)
+    )
+
+def _answer_query(answer_model, question_ids, chunk_size):
+    return (
+        select(
+            answer_model.answer_id,
+            answer_model.question_id,
+            answer_model.user_id,
+            answer_model.username,
+            answer_model.message,
+            answer_model.timestamp,
+        )
+        .where(answer_model.question_id.in_(question_ids))
+        .order_by(answer_model.question_id, answer_model.timestamp)
+        .execution_options(yield_per=chunk_size)
+    )
+
+def _sort_key(question: Dict[str, Any]):
+    return question["timestamp"], question["question_id"]
+
+async def iter_question_chunks(
+    session_factory: async_sessionmaker,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    statuses: Optional[List[QuestionStatus]] = None,
+    chunk_size: int = 1000,
+    include_archived: bool = True,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield questions (with their answers) oldest first, chunk_size at a time,
+    from the live tables and, with include_archived, the archive tables.
+    Every chunk is read in its own short transaction, resuming from the last
+    (timestamp, question_id) seen, so an export never holds a long-lived
+    snapshot or lock that would block live writers. Each table is read along
+    its (timestamp, question_id) index up to chunk_size rows and the two are
+    merged here.
+    """
+    sources = [(Question, Answer)]
+    if include_archived:
+        sources.append((ArchivedQuestion, ArchivedAnswer))
+
+    last_key = None
+    while True:
+        fetched = []
+        async with session_factory() as db:
+            for question_model, answer_model in sources:
+                result = await db.stream(_question_query(question_model, start, end, statuses, last_key, chunk_size))
+                fetched.append((answer_model, [row._asdict() async for row in result]))
+
+            questions = list(heapq.merge(*(rows for _, rows in fetched), key=_sort_key))[:chunk_size]
+            if not questions:
+                return
+            taken = {q["question_id"] for q in questions}
+
+            answer_rows = []
+            for answer_model, rows in fetched:
+                question_ids = [row["question_id"] for row in rows if row["question_id"] in taken]
+                if not question_ids:
+                    continue
+                result = await db.stream(_answer_query(answer_model, question_ids, chunk_size))
+                answer_rows.extend([row._asdict() async for row in result])
+
+        answer_rows.sort(key=lambda a: a["question_id"])
+        answers_by_question = {
+            question_id: list(answers)
+            for question_id, answers in groupby(answer_rows, key=lambda a: a["question_id"])
+        }
+        for question in questions:
+            question["answers"] = answers_by_question.get(question["question_id"], [])
+
+        yield questions
+
+        if len(questions) < chunk_size:
+            return
+        last_key = _sort_key(questions[-1])
+
+def _isoformat(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else ""
+
+async def encode_csv(chunks: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """One row per answer; questions without answers get a single row with empty answer columns."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+
+    async for questions in chunks:
+        for q in questions:
+            question_columns = [
+                q["question_id"], q["user_id"] or "", q["username"] or "Guest", q["message"],
+                q["status"].value, _isoformat(q["timestamp"]), _isoformat(q["answered_at"]),
+            ]
+            if not q["answers"]:
+                writer.writerow(question_columns + [""] * 5)
+            for a in q["answers"]:
+                writer.writerow(question_columns + [
+                    a["answer_id"], a["user_id"] or "", a["username"] or "Guest",
+                    a["message"], _isoformat(a["timestamp"]),
+                ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+async def encode_jsonl(chunks: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """One JSON object per question with its answers nested."""
+    async for questions in chunks:
+        lines = []
+        for q in questions:
+            lines.append(json.dumps({
+                "question_id": q["question_id"],
+                "user_id": q["user_id"],
+                "username": q["username"] or "Guest",
+                "message": q["message"],
+                "status": q["status"].value,
+                "timestamp": _isoformat(q["timestamp"]),
+                "answered_at": _isoformat(q["answered_at"]) or None,
+                "answers": [
+                    {
+                        "answer_id": a["answer_id"],
+                        "user_id": a["user_id"],
+                        "username": a["username"] or "Guest",
+                        "message": a["message"],
+                        "timestamp": _isoformat(a["timestamp"]),
+                    }
+                    for a in q["answers"]
+                ],
+            }))
+        yield ("\n".join(lines) + "\n").encode()
+
+async def gzip_stream(data: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for block in data:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_stream(
+    session_factory: async_sessionmaker,
+    format: str = "csv",
+    gzip: bool = False,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    statuses: Optional[List[QuestionStatus]] = None,
+    chunk_size: int = 1000,
+    include_archived: bool = True,
+) -> AsyncIterator[bytes]:
+    chunks = iter_question_chunks(session_factory, start, end, statuses, chunk_size, include_archived)
+    encoded = encode_csv(chunks) if format == "csv" else encode_jsonl(chunks)
+    return gzip_stream(encoded) if gzip else encoded
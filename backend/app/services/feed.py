@@ -0,0 +1,47 @@
+from sqlalchemy import select, update, func
+from sqlalchemy.engine import Connection
+from app.models import User, Question, Answer, ArchivedQuestion, ArchivedAnswer
+
+def record_answer(question_id: str, answer: Answer):
+    """UPDATE bumping a question's feed fields for a new answer; run it in the answer's transaction."""
+    return (
+        update(Question)
+        .where(Question.question_id == question_id)
+        .values(
+            answer_count=Question.answer_count + 1,
+            last_answer_at=answer.timestamp,
+            last_answer_username=answer.username,
+        )
+    )
+
+def _backfill(conn: Connection, question_model, answer_model):
+    conn.execute(
+        update(answer_model).values(
+            username=select(User.username)
+            .where(User.user_id == answer_model.user_id)
+            .scalar_subquery()
+        )
+    )
+    conn.execute(
+        update(question_model).values(
+            username=select(User.username)
+            .where(User.user_id == question_model.user_id)
+            .scalar_subquery(),
+            answer_count=select(func.count(answer_model.answer_id))
+            .where(answer_model.question_id == question_model.question_id)
+            .scalar_subquery(),
+            last_answer_at=select(func.max(answer_model.timestamp))
+            .where(answer_model.question_id == question_model.question_id)
+            .scalar_subquery(),
+            last_answer_username=select(answer_model.username)
+            .where(answer_model.question_id == question_model.question_id)
+            .order_by(answer_model.timestamp.desc())
+            .limit(1)
+            .scalar_subquery(),
+        )
+    )
+
+def backfill_feed(conn: Connection):
+    """Recompute every denormalized feed field from the normalized data."""
+    _backfill(conn, Question, Answer)
+    _backfill(conn, ArchivedQuestion, ArchivedAnswer)
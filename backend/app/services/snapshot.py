@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+from itertools import groupby
+from datetime import datetime
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Question, Answer
+
+class SnapshotCache:
+    """
+    The most recent questions with their answers, kept current by the same
+    events that go out over /ws so new sockets can be served a snapshot
+    without touching the database.
+    """
+
+    def __init__(self, size: int = settings.WS_SNAPSHOT_SIZE):
+        self.size = size
+        # Oldest first, newest last
+        self.questions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._frame: Optional[str] = None
+
+    async def load(self, db: AsyncSession):
+        result = await db.execute(
+            select(
+                Question.question_id,
+                Question.user_id,
+                Question.username,
+                Question.message,
+                Question.status,
+                Question.timestamp,
+                Question.answer_count,
+            )
+            .order_by(Question.timestamp.desc())
+            .limit(self.size)
+        )
+
+        rows = result.all()
+
+        result = await db.execute(
+            select(
+                Answer.answer_id,
+                Answer.question_id,
+                Answer.user_id,
+                Answer.username,
+                Answer.message,
+                Answer.timestamp,
+            )
+            .where(Answer.question_id.in_([row.question_id for row in rows]))
+            .order_by(Answer.question_id, Answer.timestamp)
+        )
+        answers_by_question = {
+            question_id: [
+                {
+                    "answer_id": answer.answer_id,
+                    "question_id": answer.question_id,
+                    "user_id": answer.user_id,
+                    "username": answer.username or "Guest",
+                    "message": answer.message,
+                    "timestamp": answer.timestamp
+                }
+                for answer in answers
+            ]
+            for question_id, answers in groupby(result.all(), key=lambda a: a.question_id)
+        }
+
+        self.questions.clear()
+        for question_id, user_id, username, message, status, timestamp, answer_count in reversed(rows):
+            self.questions[question_id] = {
+                "question_id": question_id,
+                "user_id": user_id,
+                "username": username or "Guest",
+                "message": message,
+                "status": status,
+                "timestamp": timestamp,
+                "answers": answers_by_question.get(question_id, []),
+                "answer_count": answer_count,
+            }
+        self._frame = None
+
+    def add_question(self, data: Dict[str, Any]):
+        self.questions[data["question_id"]] = {
+            "question_id": data["question_id"],
+            "user_id": data["user_id"],
+            "username": data["username"],
+            "message": data["message"],
+            "status": data["status"],
+            "timestamp": data["timestamp"],
+            "answers": list(data.get("answers") or []),
+            "answer_count": len(data.get("answers") or []),
+        }
+        while len(self.questions) > self.size:
+            self.questions.popitem(last=False)
+        self._frame = None
+
+    def update_question(self, question_id: str, status=None, answers: Optional[List[Dict[str, Any]]] = None, new_answer: Optional[Dict[str, Any]] = None):
+        entry = self.questions.get(question_id)
+        if entry is None:
+            return
+        if status is not None:
+            entry["status"] = status
+        if answers is not None:
+            entry["answers"] = list(answers)
+        if new_answer is not None:
+            entry["answers"].append(new_answer)
+        entry["answer_count"] = len(entry["answers"])
+        self._frame = None
+
+    def discard(self, question_ids: Iterable[str]):
+        for question_id in question_ids:
+            self.questions.pop(question_id, None)
+        self._frame = None
+
+    def apply(self, message: Dict[str, Any]):
+        """Fold a broadcast event into the cache."""
+        event = message.get("type")
+        data = message.get("data") or {}
+
+        if event == "new_question":
+            self.add_question(data)
+        elif event == "question_updated":
+            self.update_question(
+                data["question_id"],
+                status=data.get("status"),
+                answers=data.get("answers") or [],
+            )
+        elif event == "new_answer":
+            self.update_question(data["question_id"], new_answer=data["answer"])
+        elif event == "questions_archived":
+            self.discard(data["question_ids"])
+
+    def frame(self) -> str:
+        """The serialized snapshot message, newest question first."""
+        if self._frame is None:
+            self._frame = json.dumps(
+                {"type": "snapshot", "data": list(reversed(self.questions.values()))},
+                # ISO timestamps, as GET /questions serves them, since clients render from this frame
+                default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value)
+            )
+        return self._frame
+
+snapshot_cache = SnapshotCache()
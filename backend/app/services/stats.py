@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import select, func, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import ArchivedQuestion, Question, QuestionStatus
+
+logger = logging.getLogger(__name__)
+
+class QuantileSketch:
+    """
+    Log-bucketed streaming quantile sketch (DDSketch style): every estimate is
+    within `relative_accuracy` of the true value, in memory proportional to
+    the log of the value range rather than the number of samples.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class RateCounter:
+    """Events in the trailing window, kept in one bucket per second."""
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self.counts = [0] * window_seconds
+        self.stamps = [0] * window_seconds
+
+    def add(self, at: Optional[float] = None):
+        second = int(at if at is not None else time.time())
+        slot = second % self.window_seconds
+        if self.stamps[slot] != second:
+            self.stamps[slot] = second
+            self.counts[slot] = 0
+        self.counts[slot] += 1
+
+    def total(self) -> int:
+        cutoff = int(time.time()) - self.window_seconds
+        return sum(count for count, stamp in zip(self.counts, self.stamps) if stamp > cutoff)
+
+class StatsService:
+    """
+    Dashboard counters maintained in memory from the routers' writes and
+    rebuilt from the database on startup. Counts are per worker process.
+    Archived questions stay counted: archival moves rows between tables, and
+    load() reads both, so the numbers don't change across a restart.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.status_counts: Dict[QuestionStatus, int] = {status: 0 for status in QuestionStatus}
+        self.questions_per_minute = RateCounter(60)
+        self.time_to_answer = QuantileSketch()
+
+    async def load(self, db: AsyncSession):
+        self.reset()
+
+        for model in (Question, ArchivedQuestion):
+            result = await db.execute(
+                select(model.status, func.count(model.question_id)).group_by(model.status)
+            )
+            for status, count in result.all():
+                self.status_counts[status] += count
+
+        # Question.timestamp is written with datetime.now; convert on the same clock
+        minute_ago = datetime.fromtimestamp(time.time() - 60)
+        for model in (Question, ArchivedQuestion):
+            result = await db.execute(select(model.timestamp).where(model.timestamp >= minute_ago))
+            for (timestamp,) in result.all():
+                self.questions_per_minute.add(timestamp.timestamp())
+
+        answered = union_all(*(
+            select(model.timestamp, model.answered_at).where(model.answered_at.is_not(None))
+            for model in (Question, ArchivedQuestion)
+        ))
+        result = await db.stream(select(answered.subquery()).execution_options(yield_per=1000))
+        async for timestamp, answered_at in result:
+            self.time_to_answer.add((answered_at - timestamp).total_seconds())
+
+    def record_question(self, status: QuestionStatus = QuestionStatus.PENDING):
+        self.status_counts[status] += 1
+        self.questions_per_minute.add()
+
+    def record_status_change(self, old: QuestionStatus, new: QuestionStatus, timestamp: datetime, answered_at: Optional[datetime] = None):
+        if old == new:
+            return
+        self.status_counts[old] = max(0, self.status_counts[old] - 1)
+        self.status_counts[new] += 1
+        if new == QuestionStatus.ANSWERED and answered_at is not None:
+            self.time_to_answer.add((answered_at - timestamp).total_seconds())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pending": self.status_counts[QuestionStatus.PENDING],
+            "escalated": self.status_counts[QuestionStatus.ESCALATED],
+            "answered": self.status_counts[QuestionStatus.ANSWERED],
+            "total": sum(self.status_counts.values()),
+            "questions_per_minute": self.questions_per_minute.total(),
+            "time_to_answer_seconds": {
+                "count": self.time_to_answer.count,
+                "p50": self.time_to_answer.quantile(0.5),
+                "p90": self.time_to_answer.quantile(0.9),
+                "p99": self.time_to_answer.quantile(0.99),
+            },
+        }
+
+    async def run_forever(self, interval: int = settings.STATS_PUSH_INTERVAL_SECONDS):
+        """Push the stats to admin sockets on /ws?stats=1 on a fixed cadence instead of having dashboards poll."""
+        from app.routers.websocket import manager
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await manager.send_stats({"type": "stats", "data": self.snapshot()})
+            except Exception as e:
+                logger.error("Stats push failed: %s", e)
+
+stats_service = StatsService()
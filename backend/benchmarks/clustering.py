@@ -0,0 +1,272 @@
+"""
+Clustering scalability and quality benchmark.
+
+Generates synthetic question corpora with known ground-truth groups and runs
+every registered grouping engine over them, recording wall time, peak RSS and
+grouping quality (adjusted Rand index and the purity/inverse purity F-score).
+Each case runs in its own process so RSS and timeouts are isolated.
+
+Run from the backend directory:
+
+    python -m benchmarks.clustering --sizes 100 1000 --output bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+QUESTION_WORDS = ["How do I", "How can I", "Is it possible to", "What is the way to", "Where can I", "Why can't I"]
+VERBS = {
+    "reset": ["restore", "clear"],
+    "export": ["download", "extract"],
+    "share": ["send", "distribute"],
+    "delete": ["remove", "erase"],
+    "update": ["change", "modify"],
+    "schedule": ["plan", "book"],
+    "approve": ["accept", "sign off"],
+    "upload": ["submit", "attach"],
+    "track": ["monitor", "follow"],
+    "cancel": ["stop", "abort"],
+    "configure": ["set up", "adjust"],
+    "review": ["check", "inspect"],
+}
+OBJECTS = {
+    "password": ["login credentials", "passcode"],
+    "invoice": ["bill", "billing statement"],
+    "shipment": ["delivery", "consignment"],
+    "quarterly report": ["quarter summary", "Q report"],
+    "driver log": ["driver logbook", "hours log"],
+    "fuel card": ["fuel payment card", "gas card"],
+    "route plan": ["trip plan", "routing schedule"],
+    "maintenance ticket": ["repair request", "service ticket"],
+    "payroll record": ["salary record", "pay slip"],
+    "customer contract": ["client agreement", "customer agreement"],
+    "load board posting": ["freight listing", "load listing"],
+    "insurance certificate": ["coverage certificate", "insurance document"],
+    "dispatch note": ["dispatch memo", "dispatch message"],
+    "trailer inspection": ["trailer check", "trailer audit"],
+    "team calendar": ["group calendar", "shared calendar"],
+}
+CONTEXTS = [
+    "in the dashboard", "from the mobile app", "for last month", "for the whole team",
+    "before the deadline", "without admin rights", "after the update", "for a new hire",
+    "in bulk", "on the web portal", "for an external partner", "during the event",
+    "from my laptop", "for the west region", "for a closed account", "with two-factor enabled",
+]
+FILLERS = ["Quick question:", "Hi all,", "Sorry if this was asked,", "Hey team,", "Urgent:", ""]
+
+SYLLABLES = ["ka", "lo", "mir", "ten", "vo", "ra", "quin", "del", "sa", "bor", "ny", "tal", "ex", "pru", "gan", "ol"]
+
+Intent = Tuple[str, str, str, str]
+
+def _entities(rng: random.Random, count: int = 300) -> List[str]:
+    """Made-up customer/site names: rare tokens that set otherwise similar questions apart."""
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize())
+    return sorted(names)
+
+def _new_intent(rng: random.Random, entities: List[str], used: set) -> Intent:
+    while True:
+        intent = (rng.choice(list(VERBS)), rng.choice(list(OBJECTS)), rng.choice(CONTEXTS), rng.choice(entities))
+        if intent not in used:
+            used.add(intent)
+            return intent
+
+def _render(intent: Intent) -> str:
+    verb, obj, context, entity = intent
+    return f"{QUESTION_WORDS[0]} {verb} the {entity} {obj} {context}?"
+
+def _paraphrase(intent: Intent, rng: random.Random) -> str:
+    verb, obj, context, entity = intent
+    verb = rng.choice(VERBS[verb] + [verb])
+    obj = rng.choice(OBJECTS[obj] + [obj])
+    if rng.random() < 0.3:
+        text = f"{context.capitalize()}, {rng.choice(QUESTION_WORDS).lower()} {verb} the {obj} for {entity}?"
+    else:
+        text = f"{rng.choice(QUESTION_WORDS)} {verb} the {entity} {obj} {context}?"
+    return f"{rng.choice(FILLERS)} {text}".strip()
+
+def generate_corpus(size: int, duplicate_rate: float, paraphrase_rate: float, seed: int) -> Tuple[List[str], List[int]]:
+    """
+    Build `size` questions with ground-truth group labels. Each question is an
+    exact duplicate of an existing group, a paraphrase of one, or a new group.
+    """
+    rng = random.Random(seed)
+    entities = _entities(rng)
+    used: set = set()
+    messages: List[str] = []
+    labels: List[int] = []
+    groups: List[Intent] = []
+
+    for _ in range(size):
+        roll = rng.random()
+        if groups and roll < duplicate_rate:
+            label = rng.randrange(len(groups))
+            messages.append(_render(groups[label]))
+        elif groups and roll < duplicate_rate + paraphrase_rate:
+            label = rng.randrange(len(groups))
+            messages.append(_paraphrase(groups[label], rng))
+        else:
+            label = len(groups)
+            groups.append(_new_intent(rng, entities, used))
+            messages.append(_render(groups[label]))
+        labels.append(label)
+
+    return messages, labels
+
+def tfidf_agglomerative(messages: List[str]) -> List[int]:
+    """
+    The production clustering step. Calls ClusterService.cluster_labels rather
+    than group_questions, whose one-group-per-question fallback would hide
+    failures such as a MemoryError under --memory-limit-mb.
+    """
+    from app.services.clustering import ClusterService
+
+    return list(ClusterService().cluster_labels(messages))
+
+def tfidf_radius_graph(messages: List[str]) -> List[int]:
+    """Sparse alternative: connected components of the cosine radius-neighbour graph."""
+    from scipy.sparse.csgraph import connected_components
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.neighbors import radius_neighbors_graph
+
+    tfidf_matrix = TfidfVectorizer(stop_words='english').fit_transform(messages)
+    graph = radius_neighbors_graph(tfidf_matrix, radius=0.6, metric='cosine', mode='connectivity')
+    _, labels = connected_components(graph, directed=False)
+    return labels.tolist()
+
+ENGINES: Dict[str, Callable[[List[str]], List[int]]] = {
+    "tfidf-agglomerative": tfidf_agglomerative,
+    "tfidf-radius-graph": tfidf_radius_graph,
+}
+
+def _majority_share(labels: List[int], other_labels: List[int]) -> float:
+    clusters: Dict[int, Counter] = {}
+    for label, other in zip(labels, other_labels):
+        clusters.setdefault(label, Counter())[other] += 1
+    return sum(counts.most_common(1)[0][1] for counts in clusters.values()) / len(labels)
+
+def purity(true_labels: List[int], predicted_labels: List[int]) -> float:
+    """
+    Harmonic mean of purity and inverse purity. Plain purity is 1.0 for
+    one-group-per-question output; inverse purity penalises that split, as
+    plain purity penalises lumping everything together.
+    """
+    forward = _majority_share(predicted_labels, true_labels)
+    inverse = _majority_share(true_labels, predicted_labels)
+    return 2 * forward * inverse / (forward + inverse)
+
+WARMUP_SIZE = 50
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _run_case(engine: str, size: int, args: argparse.Namespace, conn):
+    from sklearn.metrics import adjusted_rand_score
+
+    if args.memory_limit_mb:
+        limit = args.memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    messages, true_labels = generate_corpus(size, args.duplicate_rate, args.paraphrase_rate, args.seed)
+    try:
+        # Warm-up on a small corpus so the engine's imports and one-off setup
+        # count towards neither the wall time nor the RSS delta
+        warmup_messages, _ = generate_corpus(WARMUP_SIZE, args.duplicate_rate, args.paraphrase_rate, args.seed + 1)
+        ENGINES[engine](warmup_messages)
+
+        rss_before = _peak_rss_mb()
+        start = time.perf_counter()
+        predicted_labels = ENGINES[engine](messages)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        # MemoryError under the RLIMIT_AS cap lands here
+        conn.send({"error": f"{type(e).__name__}: {e}", "peak_rss_mb": round(_peak_rss_mb(), 1)})
+        return
+
+    conn.send({
+        "wall_time_s": round(elapsed, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_before_mb": round(rss_before, 1),
+        "true_groups": len(set(true_labels)),
+        "predicted_groups": len(set(predicted_labels)),
+        "ari": round(adjusted_rand_score(true_labels, predicted_labels), 4),
+        "purity": round(purity(true_labels, predicted_labels), 4),
+    })
+
+def run_case(engine: str, size: int, args: argparse.Namespace) -> Dict:
+    result = {"engine": engine, "size": size}
+    context = multiprocessing.get_context("spawn")
+    # A Pipe sends synchronously; a Queue needs a feeder thread, which can
+    # deadlock the child when it reports a MemoryError under the RLIMIT_AS cap
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(engine, size, args, sender))
+    process.start()
+    process.join(args.timeout)
+
+    if process.is_alive():
+        process.kill()
+        process.join()
+        result["status"] = "timeout"
+    elif receiver.poll():
+        outcome = receiver.recv()
+        result["status"] = "error" if "error" in outcome else "ok"
+        result.update(outcome)
+    else:
+        result["status"] = "error"
+        result["exit_code"] = process.exitcode
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument("--duplicate-rate", type=float, default=0.2)
+    parser.add_argument("--paraphrase-rate", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds per case before it is killed")
+    parser.add_argument("--memory-limit-mb", type=int, default=8192, help="Address space cap per case, 0 for none")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        for engine in args.engines:
+            result = run_case(engine, size, args)
+            print(json.dumps(result), file=sys.stderr)
+            results.append(result)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "duplicate_rate": args.duplicate_rate,
+            "paraphrase_rate": args.paraphrase_rate,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
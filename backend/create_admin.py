@@ -1,19 +1,43 @@
+"""
+Create the admin account, and optionally seed the database with synthetic data.
+
+    python create_admin.py
+    python create_admin.py seed --users 100000 --questions 1000000 --seed 42
+"""
+import argparse
 import asyncio
-from sqlalchemy import select, update
-from app.database import AsyncSessionLocal, init_db
-from app.models import User
+import bisect
+import contextlib
+import functools
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from passlib.context import CryptContext
+from sqlalchemy import select, DateTime
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models import User, Question, Answer, QuestionStatus
 from app.auth import get_password_hash
 
+SEED_PASSWORD = "password"
+
+WORDS = (
+    "how when why where can should does the a to for with driver load route invoice "
+    "shipment fuel dispatch trailer schedule payroll report dashboard export reset "
+    "password update team customer contract portal mobile app delivery delay status "
+    "approve cancel track inspect maintenance region weekly monthly deadline access"
+).split()
+
 async def create_admin():
     await init_db()
-    
+
     async with AsyncSessionLocal() as session:
-        
+
         result = await session.execute(select(User).filter(User.email == "admin@hemut.com"))
         admin = result.scalar_one_or_none()
-        
+
         if not admin:
-            
+
             admin = User(
                 username="admin",
                 email="admin@hemut.com",
@@ -27,7 +51,252 @@ async def create_admin():
             admin.is_admin = True
             await session.commit()
 
-            
-            
+def _uuid(rng: random.Random) -> str:
+    # Same format as uuid4 without building UUID objects
+    h = f"{rng.getrandbits(128):032x}"
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+def _sentences(rng: random.Random, low: int, high: int, count: int = 4096):
+    """A pool to draw messages from; building a fresh sentence per row dominates seeding time."""
+    return [" ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + "?" for _ in range(count)]
+
+def _parse_weights(value: str):
+    weights = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        weights[QuestionStatus[name.strip().upper()]] = float(weight)
+    return weights
+
+# Column order of the tuples the generators below yield
+USER_COLUMNS = ("user_id", "username", "email", "password_hash", "is_admin", "created_at")
+QUESTION_COLUMNS = (
+    "question_id", "user_id", "username", "message", "status", "timestamp",
+    "answer_count", "last_answer_at", "last_answer_username", "answered_at",
+)
+ANSWER_COLUMNS = ("answer_id", "question_id", "user_id", "username", "message", "timestamp")
+
+@functools.lru_cache(maxsize=None)
+def _insert_sql(dialect, table, columns) -> str:
+    """A driver-level INSERT in the dialect's paramstyle."""
+    if dialect.paramstyle == "qmark":
+        placeholders = ["?"] * len(columns)
+    elif dialect.paramstyle == "numeric_dollar":
+        placeholders = [f"${i}" for i in range(1, len(columns) + 1)]
+    elif dialect.paramstyle == "numeric":
+        placeholders = [f":{i}" for i in range(1, len(columns) + 1)]
+    else:
+        placeholders = ["%s"] * len(columns)
+    return f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+
+def _datetime_bind(dialect):
+    """What the dialect stores for a datetime (a fixed-format string on SQLite), applied once per value."""
+    return DateTime().bind_processor(dialect) or (lambda value: value)
+
+async def _execute(conn, inserts) -> int:
+    count = 0
+    for table, columns, rows in inserts:
+        if not rows:
+            continue
+        # Primary key order keeps the index pages a batch touches together
+        rows.sort()
+        if conn.dialect.driver == "asyncpg":
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(table.name, records=rows, columns=columns)
+        else:
+            await conn.exec_driver_sql(_insert_sql(conn.dialect, table, columns), rows)
+        count += len(rows)
+    return count
+
+async def _load(conn, batches, commit_every: int):
+    """
+    Write plain tuples straight through the driver (COPY on asyncpg, else
+    executemany), skipping SQLAlchemy's per-row dict handling and bind
+    processing. `batches` yields lists of (table, columns, rows). Commits
+    every `commit_every` rows.
+
+    The next batch is generated while the driver thread writes the previous
+    one, but both need the GIL (generation is pure Python, and sqlite3 binds
+    each row under it), so they mostly take turns: the load costs roughly
+    generation plus write time, not the larger of the two. It still edges out
+    writing each batch before generating the next.
+    """
+    pending = None
+    since_commit = 0
+    for inserts in batches:
+        if pending is not None:
+            since_commit += await pending
+            if since_commit >= commit_every:
+                await conn.commit()
+                since_commit = 0
+        pending = asyncio.ensure_future(_execute(conn, inserts))
+        # Let it hand the statement to the driver thread, which releases the
+        # GIL inside each sqlite3 step, before generating more
+        await asyncio.sleep(0)
+    if pending is not None:
+        await pending
+    await conn.commit()
+
+def _chunks(rows_iter, size: int):
+    while True:
+        chunk = list(itertools.islice(rows_iter, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _generate_users(rng: random.Random, args, password_hash: str, users: list, to_db):
+    created_at = to_db(datetime.utcnow())
+    for i in range(args.users):
+        user_id = _uuid(rng)
+        username = f"{args.prefix}{i:07d}"
+        users.append((user_id, username))
+        yield (user_id, username, f"{username}@{args.prefix}.example.com", password_hash, False, created_at)
+
+def _generate_questions(rng: random.Random, args, users: list, answers: list, to_db):
+    """
+    Yields question rows as QUESTION_COLUMNS tuples; answer rows for each
+    question are appended to `answers`. Values are already in the form the
+    driver stores (`to_db` for datetimes, enum names for status).
+    """
+    statuses = [(status, status.name) for status in args.status_weights]
+    cumulative = list(itertools.accumulate(args.status_weights.values()))
+    now = datetime.now()
+    # Question timestamps use local time, answer timestamps UTC (see app.models)
+    utc_offset = datetime.now() - datetime.utcnow()
+    span = args.days * 86400
+    question_messages = _sentences(rng, 5, 18)
+    answer_messages = _sentences(rng, 4, 20)
+    # Plain indexing on rng.random() instead of rng.choice/choices, which cost more than the insert
+    rand = rng.random
+    user_count = len(users)
+    no_user = (None, None)
+
+    for _ in range(args.questions):
+        author = users[int(rand() * user_count)] if users and rand() >= args.guest_rate else no_user
+        timestamp = now - timedelta(seconds=rand() * span)
+        status, status_name = statuses[bisect.bisect(cumulative, rand() * cumulative[-1])]
+
+        if status == QuestionStatus.ANSWERED or rand() < args.answer_rate:
+            answer_count = rng.randint(1, args.max_answers)
+        else:
+            answer_count = 0
+
+        question_id = _uuid(rng)
+        answered_at = None
+        last_answer_at = None
+        last_answer_username = None
+        answer_time = timestamp
+        for _ in range(answer_count):
+            answer_time = min(now, answer_time + timedelta(seconds=rng.expovariate(1 / args.mean_answer_seconds)))
+            answerer = users[int(rand() * user_count)] if users else no_user
+            last_answer_at = to_db(answer_time - utc_offset)
+            last_answer_username = answerer[1]
+            answers.append((
+                _uuid(rng), question_id, answerer[0], answerer[1],
+                answer_messages[int(rand() * len(answer_messages))], last_answer_at,
+            ))
+        if status == QuestionStatus.ANSWERED:
+            answered_at = to_db(answer_time)
+
+        yield (
+            question_id, author[0], author[1], question_messages[int(rand() * len(question_messages))],
+            status_name, to_db(timestamp), answer_count, last_answer_at, last_answer_username, answered_at,
+        )
+
+@contextlib.asynccontextmanager
+async def _without_secondary_indexes(conn, tables):
+    """Drop non-unique indexes for the load and build them once at the end, which is far cheaper than row by row."""
+    indexes = [index for table in tables for index in table.indexes if not index.unique]
+    for index in indexes:
+        await conn.run_sync(lambda sync_conn, index=index: index.drop(sync_conn, checkfirst=True))
+    await conn.commit()
+    try:
+        yield
+    finally:
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+        await conn.commit()
+
+async def seed(args):
+    await init_db()
+    rng = random.Random(args.seed)
+    # One cheap hash shared by every seed user; they can all log in with SEED_PASSWORD
+    password_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(SEED_PASSWORD)
+
+    dialect = engine.dialect
+    to_db = _datetime_bind(dialect)
+
+    async with engine.connect() as conn:
+        journal_mode = None
+        if dialect.name == "sqlite":
+            # synchronous and cache_size are per connection; journal_mode sticks
+            # to the database file, so it is put back afterwards
+            journal_mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+            await conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            await conn.exec_driver_sql("PRAGMA cache_size=-262144")
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            await conn.commit()
+
+        try:
+            users = []
+            start = time.perf_counter()
+            await _load(
+                conn,
+                ([(User.__table__, USER_COLUMNS, chunk)] for chunk in _chunks(_generate_users(rng, args, password_hash, users, to_db), args.batch_size)),
+                args.commit_every,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"users: {len(users)} rows in {elapsed:.1f}s ({len(users) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+            start = time.perf_counter()
+            answers = []
+            totals = {"questions": 0, "answers": 0}
+
+            def question_batches():
+                # Each batch of questions goes in with the answers generated alongside it
+                for chunk in _chunks(_generate_questions(rng, args, users, answers, to_db), args.batch_size):
+                    chunk_answers = answers[:]
+                    answers.clear()
+                    totals["questions"] += len(chunk)
+                    totals["answers"] += len(chunk_answers)
+                    yield [(Question.__table__, QUESTION_COLUMNS, chunk), (Answer.__table__, ANSWER_COLUMNS, chunk_answers)]
+
+            async with _without_secondary_indexes(conn, [Question.__table__, Answer.__table__]):
+                await _load(conn, question_batches(), args.commit_every)
+            elapsed = time.perf_counter() - start
+            rows = totals["questions"] + totals["answers"]
+            print(
+                f"questions: {totals['questions']}, answers: {totals['answers']} in {elapsed:.1f}s "
+                f"({rows / max(elapsed, 1e-9):,.0f} rows/s, including index builds)"
+            )
+        finally:
+            if journal_mode and journal_mode.lower() != "wal":
+                await conn.exec_driver_sql(f"PRAGMA journal_mode={journal_mode}")
+                await conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+
+    seed_parser = subparsers.add_parser("seed", help="Bulk-insert synthetic users, questions and answers")
+    seed_parser.add_argument("--users", type=int, default=1000)
+    seed_parser.add_argument("--questions", type=int, default=10000)
+    seed_parser.add_argument("--status-weights", type=_parse_weights, default="pending=0.5,escalated=0.1,answered=0.4",
+                             help="Relative status mix, e.g. pending=0.5,escalated=0.1,answered=0.4")
+    seed_parser.add_argument("--guest-rate", type=float, default=0.2, help="Share of questions asked by guests")
+    seed_parser.add_argument("--answer-rate", type=float, default=0.1, help="Share of unanswered questions that still have replies")
+    seed_parser.add_argument("--max-answers", type=int, default=3)
+    seed_parser.add_argument("--mean-answer-seconds", type=float, default=600)
+    seed_parser.add_argument("--days", type=float, default=30, help="Spread question timestamps over this many days")
+    seed_parser.add_argument("--prefix", default="seed", help="Username/email prefix, change it to seed the same DB twice")
+    seed_parser.add_argument("--seed", type=int, default=42)
+    seed_parser.add_argument("--batch-size", type=int, default=5000)
+    seed_parser.add_argument("--commit-every", type=int, default=100000)
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        asyncio.run(seed(args))
+    else:
+        asyncio.run(create_admin())
+
 if __name__ == "__main__":
-    asyncio.run(create_admin())
\ No newline at end of file
+    main()
@@ -0,0 +1,47 @@
+"""
+Export the Q&A history to CSV or JSONL, optionally gzipped.
+
+    python export_questions.py --format csv --gzip --output questions.csv.gz
+    python export_questions.py --format jsonl --status Answered --start 2025-01-01
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from app.database import session_router
+from app.models import QuestionStatus
+from app.services.export import export_stream
+
+async def export(args):
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for block in export_stream(
+            session_router.for_read(),
+            args.format,
+            args.gzip,
+            args.start,
+            args.end,
+            args.status,
+            args.chunk_size,
+            not args.live_only,
+        ):
+            output.write(block)
+    finally:
+        if args.output:
+            output.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Only questions asked at or after this time")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Only questions asked before this time")
+    parser.add_argument("--status", type=QuestionStatus, action="append", choices=list(QuestionStatus))
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--live-only", action="store_true", help="Leave out archived questions")
+    parser.add_argument("--output", help="File to write, defaults to stdout")
+    args = parser.parse_args()
+    asyncio.run(export(args))
+
+if __name__ == "__main__":
+    main()
@@ -31,9 +31,18 @@ export default function Home() {
 
   // WebSocket setup
   useEffect(() => {
-    fetchQuestions();
-
     const socket = getSocket();
+    const alreadyOpen = socket.isOpen;
+
+    // A new socket's snapshot frame is the initial load. An already open one
+    // (page remount) won't send another, and REST covers a snapshot that never arrives.
+    const fallback = setTimeout(fetchQuestions, alreadyOpen ? 0 : 5000);
+
+    const handleSnapshot = (snapshot: Question[]) => {
+      clearTimeout(fallback);
+      setQuestions(snapshot);
+      setIsLoading(false);
+    };
 
     const handleConnect = () => {
       console.log('WebSocket connected');
@@ -78,22 +87,32 @@ export default function Home() {
       );
     };
 
+    const handleQuestionsArchived = ({ question_ids }: { question_ids: string[] }) => {
+      const archived = new Set(question_ids);
+      setQuestions((prev) => prev.filter((q) => !archived.has(q.question_id)));
+    };
+
+    socket.on('snapshot', handleSnapshot);
     socket.on('connect', handleConnect);
     socket.on('disconnect', handleDisconnect);
     socket.on('new_question', handleNewQuestion);
     socket.on('question_updated', handleQuestionUpdated);
     socket.on('new_answer', handleNewAnswer);
+    socket.on('questions_archived', handleQuestionsArchived);
 
     if (user?.is_admin && 'Notification' in window && Notification.permission === 'default') {
       Notification.requestPermission();
     }
 
     return () => {
+      clearTimeout(fallback);
+      socket.off('snapshot', handleSnapshot);
       socket.off('connect', handleConnect);
       socket.off('disconnect', handleDisconnect);
       socket.off('new_question', handleNewQuestion);
       socket.off('question_updated', handleQuestionUpdated);
       socket.off('new_answer', handleNewAnswer);
+      socket.off('questions_archived', handleQuestionsArchived);
     };
   }, [fetchQuestions]); 
 
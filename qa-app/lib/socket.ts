@@ -1,4 +1,4 @@
-type WebSocketEvent = 'new_question' | 'question_updated' | 'new_answer' | 'connect' | 'disconnect';
+type WebSocketEvent = 'snapshot' | 'new_question' | 'question_updated' | 'new_answer' | 'questions_archived' | 'connect' | 'disconnect';
 type MessageHandler = (data: any) => void;
 
 class WebSocketService {
@@ -27,7 +27,8 @@ class WebSocketService {
             }
         }
 
-        this.url = url;
+        // Every (re)connect starts with a snapshot of the recent questions
+        this.url = `${url}?snapshot=1`;
     }
 
     public connect() {
@@ -51,6 +52,11 @@ class WebSocketService {
             this.socket.onmessage = (event) => {
                 try {
                     const payload = JSON.parse(event.data);
+                    // Server heartbeat, answer so the connection isn't reaped as idle
+                    if (payload.type === 'ping') {
+                        this.socket?.send(JSON.stringify({ type: 'pong' }));
+                        return;
+                    }
                     // Expecting payload in format: { type: "event_name", data: ... }
                     if (payload.type && payload.data) {
                         this.emit(payload.type, payload.data);
@@ -81,6 +87,10 @@ class WebSocketService {
         }
     }
 
+    public get isOpen(): boolean {
+        return this.socket?.readyState === WebSocket.OPEN;
+    }
+
     public disconnect() {
         this.isExplicitlyDisconnected = true;
         if (this.socket) {